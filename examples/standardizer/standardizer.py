@@ -72,7 +72,8 @@ class Standardizer(Preprocessor):
         """ Standardize the dataset. """
         pt = preprocessing.StandardScaler()
         pt.fit(self.input_ds) 
-        self.output_ds = pt.transform(self.input_ds) 
+        # transform in-place to avoid allocating a second full-size copy of the dataset
+        self.output_ds = pt.transform(self.input_ds, copy=False) 
         if hasattr(self, "no_config"):
             if self.no_config == False:
                 dump(pt, self.output_config_file)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+This File contains the plotting helpers used by the FeatureEng plugins. 
+"""
+
+__author__ = "Harvey Bastidas"
+__copyright__ = "Harvey Bastidas"
+__license__ = "mit"
+
+def new_figure(figsize):
+    """ Creates a figure with a single axes, saved to files with the Agg canvas.
+
+    The figure is not registered in pyplot, so the caller's matplotlib backend and figures are not modified.
+
+    Args:
+    figsize (tuple): width and height of the figure in inches
+
+    Returns:
+    (Figure, Axes): figure and its axes
+    """
+    # the plotting module is slow to import, import it only if plots were requested
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(111)
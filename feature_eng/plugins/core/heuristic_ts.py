@@ -6,11 +6,14 @@ This File contains the HeuristicTS class plugin.
 from feature_eng.plugin_base import PluginBase
 import numpy as np
 from sys import exit
+import logging
 
 __author__ = "Harvey Bastidas"
 __copyright__ = "Harvey Bastidas"
 __license__ = "mit"
 
+_logger = logging.getLogger(__name__)
+
 class HeuristicTS(PluginBase): 
     """ Core plugin for the FeatureEng class, after initialization, saves the data and after calling the store_data method """
 
@@ -25,7 +28,7 @@ class HeuristicTS(PluginBase):
         parser.add_argument("--forward_ticks", help="Number of forwrard ticks in the future for ema_fast", default=10, type=int)
         parser.add_argument("--ema_fast", help="Column index for ema fast", default=0, type=int)
         parser.add_argument("--ema_slow", help="Column index for ema slow", default=1, type=int)
-        parser.add_argument("--use_current", help="Do not use future data but only past data for the training signal calculus. Defaults to False", action="store_true", default=False)
+        parser.add_argument("--use_current", help="Deprecated, has no effect: the training signal is the same with or without it. Defaults to False", action="store_true", default=False)
         return parser
 
     def core(self, input_ds):
@@ -38,12 +41,10 @@ class HeuristicTS(PluginBase):
         self.output_ds = np.empty(shape=(self.rows_d-self.conf.forward_ticks, 1))
         # calculate the output
 
-        # implements current
-        if self.conf.use_current == False:
-            for i in range(self.rows_d - self.conf.forward_ticks): 
-                self.output_ds[i] = input_ds[i + self.conf.forward_ticks, self.conf.ema_fast] - input_ds[i, self.conf.ema_slow]
-        else:
-            for i in range(self.conf.forward_ticks, self.rows_d): 
-                self.output_ds[i-self.conf.forward_ticks] = input_ds[i, self.conf.ema_fast] - input_ds[i - self.conf.forward_ticks, self.conf.ema_slow]
+        if self.conf.use_current == True:
+            _logger.warning("--use_current is deprecated and has no effect on the training signal")
+        # both cases are computed as a single vectorized substraction of shifted column slices,
+        # with or without use_current, output row i is ema_fast at tick i+forward_ticks minus ema_slow at tick i
+        self.output_ds[:, 0] = input_ds[self.conf.forward_ticks:, self.conf.ema_fast] - input_ds[:self.rows_d - self.conf.forward_ticks, self.conf.ema_slow]
         
         return self.output_ds
@@ -4,18 +4,19 @@ This File contains the MSSADecomposer class plugin.
 """
 
 from feature_eng.plugin_base import PluginBase
+from feature_eng.plotting import new_figure
 import numpy as np
 from sys import exit
 from pymssa import MSSA
-import copy
 import json
-import seaborn as sns
-import matplotlib.pyplot as plt
+import logging
 
 __author__ = "Harvey Bastidas"
 __copyright__ = "Harvey Bastidas"
 __license__ = "mit"
 
+_logger = logging.getLogger(__name__)
+
 class MSSADecomposer(PluginBase):
     """ Core plugin for the FeatureEng class, after initialization, saves the data and after calling the store_data method """
 
@@ -45,14 +46,28 @@ class MSSADecomposer(PluginBase):
             input_ds = input_ds.reshape(self.rows_d,self.cols_d)
         # create an empty array with the estimated output shape
         self.output_ds = np.empty(shape=(self.rows_d-self.conf.window_size, self.cols_d))
-        
+
         # center the input_ds before fitting
         in_means = np.nanmean(input_ds, axis=0)
         input_ds = input_ds - in_means
 
         # calculate the output by performing MSSA on <segments> number of windows of data of size window_size
         segments = (self.rows_d // (2*self.conf.window_size))
-        grouped_output = []
+        # components of each segment, concatenated once after the loop
+        seg_components = []
+        grouped_output = [[] for j in range(0, self.cols_d)]
+        # pymssa prints its fitting progress only if debug messages are enabled
+        verbose = _logger.isEnabledFor(logging.DEBUG)
+        # the MSSA instance is constructed once and refitted for each segment
+        # uses SVHT for selecting number of components if required from the conf parameters
+        if self.conf.num_components == 0:
+            mssa = MSSA(n_components='svht', window_size=self.conf.window_size, verbose=verbose)
+        else:
+            mssa = MSSA(n_components=self.conf.num_components, window_size=self.conf.window_size, verbose=verbose)
+        # load the groups from a json file only once, the same groups are used in all the segments
+        if self.conf.group_file != None:
+            with open(self.conf.group_file) as json_file:
+                ts0_groups = json.load(json_file)
         for i in range(0, segments):
             # verify if i+(2*self.conf.window_size) is the last observation
             first = i * (2 * self.conf.window_size)
@@ -62,102 +77,87 @@ class MSSADecomposer(PluginBase):
                 last = self.rows_d
             # slice the input_ds dataset in 2*self.conf.window_size ticks segments
             s_data_w = input_ds[first : last,:]
+            mssa.fit(s_data_w)
             # only the first time, run svht, in following iterations, use the same n_components, without executing the svht algo
-            if i == 0:
-                # uses SVHT for selecting number of components if required from the conf parameters
-                if self.conf.num_components == 0:
-                    mssa = MSSA(n_components='svht', window_size=self.conf.window_size, verbose=True)
-                    mssa.fit(s_data_w)
-                    print("Automatically Selected Rank (number of components)= ",str(mssa.rank_))
-                    rank = int(mssa.rank_)
-                else:
-                    rank = self.conf.num_components
-                    mssa = MSSA(n_components=rank, window_size=self.conf.window_size, verbose=True)
-                    mssa.fit(s_data_w)
-            else:
-                mssa = MSSA(n_components=rank, window_size=self.conf.window_size, verbose=True)
-                mssa.fit(s_data_w)
+            if mssa.n_components == 'svht':
+                _logger.info("Automatically Selected Rank (number of components)= %s", mssa.rank_)
+                mssa.n_components = int(mssa.rank_)
 
-            # concatenate otput array with the new components
-            if i == 0:
-                if self.conf.group_file == None:
-                    self.output_ds = np.array(mssa.components_)
-            else:
-                if self.conf.group_file == None:
-                    self.output_ds = np.concatenate((self.output_ds, mssa.components_), axis = 1)
+            # append the new components to the list of segment components
+            if self.conf.group_file == None:
+                seg_components.append(mssa.components_)
            
-            # load the groups from a json file, use the same groups for all the features
+            # use the groups loaded from the json file for all the features
             if self.conf.group_file != None:
-                print("Grouping correlated components (manually set list)")
-                with open(self.conf.group_file) as json_file:
-                    ts0_groups = json.load(json_file)
+                _logger.debug("Grouping correlated components (manually set list)")
                 for j in range(0, self.cols_d):
                     # draw correlation matrix for the first segment
                     mssa.set_ts_component_groups(j, ts0_groups)
                     ts0_grouped = mssa.grouped_components_[j]
-                    # concatenate otput array with the new components
-                    if i == 0:
-                        grouped_output.append(copy.deepcopy(mssa.grouped_components_[j]))
-                    else:
-                        grouped_output[j] = np.concatenate((grouped_output[j], copy.deepcopy(mssa.grouped_components_[j])), axis = 0)
+                    # append the new grouped components to the list of segments of the feature
+                    grouped_output[j].append(np.array(mssa.grouped_components_[j], copy=True))
                     # save the correlation matrix only for the first segment
                     if (i == 0) and (self.conf.w_prefix != None):
                         # save grouped component correlation matrix
-                        ts0_grouped_wcor = mssa.w_correlation(ts0_grouped)
-                        fig, ax = plt.subplots(figsize=(12,9))
-                        sns.heatmap(np.abs(ts0_grouped_wcor), cmap='coolwarm', ax=ax)
-                        ax.set_title('grouped component w-correlations')
-                        fig.savefig(self.conf.w_prefix + str(j) + '_grouped.png', dpi=200)
-                self.output_ds = np.array(grouped_output)
+                        self.plot_w_correlation(mssa, ts0_grouped, 'grouped component w-correlations', self.conf.w_prefix + str(j) + '_grouped.png')
             else:
                 # save the correlation matrix only for the first segment
                 for j in range(0, self.cols_d):
                     if (i == 0) and (self.conf.w_prefix != None):
                         total_comps = mssa.components_[j, :, :]
                         # save grouped component correlation matrix
-                        ts0_wcor = mssa.w_correlation(total_comps)
-                        fig, ax = plt.subplots(figsize=(12,9))
-                        sns.heatmap(np.abs(ts0_wcor), cmap='coolwarm', ax=ax)
-                        ax.set_title('component w-correlations')
-                        fig.savefig(self.conf.w_prefix + str(j) + '.png', dpi=200)
-                grouped_output = self.output_ds.tolist()
+                        self.plot_w_correlation(mssa, total_comps, 'component w-correlations', self.conf.w_prefix + str(j) + '.png')
+        # build the output array once, after all the segments were processed
+        if self.conf.group_file != None:
+            self.output_ds = np.array([np.concatenate(feature_segs, axis = 0) for feature_segs in grouped_output])
+        else:
+            self.output_ds = np.concatenate(seg_components, axis = 1)
         # show progress
         # save the correlation matrix only for the first segment
         if (i == 0) and (self.conf.w_prefix != None):
             # save grouped component correlation matrix
-            ts0_grouped_wcor = mssa.w_correlation(ts0_grouped)
-            fig, ax = plt.subplots(figsize=(12,9))
-            sns.heatmap(np.abs(ts0_grouped_wcor), cmap='coolwarm', ax=ax)
-            ax.set_title('grouped component w-correlations')
-            fig.savefig(self.conf.w_prefix + str(j) + '.png', dpi=200)
+            self.plot_w_correlation(mssa, ts0_grouped, 'grouped component w-correlations', self.conf.w_prefix + str(j) + '.png')
         progress = i*100/segments
-        print("Segment: ",i,"/",segments, "     Progress: ", progress," %" )
+        _logger.debug("Segment: %s/%s     Progress: %s %%", i, segments, progress)
         if self.conf.plot_prefix != None:
             # Graficar matriz de correlaciones del primero y  agrupar aditivamente los mas correlated.
             # genera gráficas para cada componente con valores agrupados
             # for the 5th and the next components, save plots containing the original and cummulative timeseries for the first data column
-            cumulative_recon = np.zeros_like(input_ds[:, 0])
-            for comp in range(len(grouped_output[0][0])):
-                fig, ax = plt.subplots(figsize=(18, 7))
-                current_component = self.output_ds[0,:, comp]
-                cumulative_recon = cumulative_recon + current_component
-                ax.plot(input_ds[:, 0], lw=3, alpha=0.2, c='k', label='original')
-                ax.plot(cumulative_recon, lw=3, c='darkgoldenrod', alpha=0.6, label='cumulative'.format(comp))
-                ax.plot(current_component, lw=3, c='steelblue', alpha=0.8, label='component={}'.format(comp))
+            # cumulative reconstruction of the first feature for every number of components
+            cumulative_recon = np.cumsum(self.output_ds[0], axis=1)
+            # a single figure is used for all the components, only the data of the cumulative and component lines is updated
+            fig, ax = new_figure((18, 7))
+            ax.plot(input_ds[:, 0], lw=3, alpha=0.2, c='k', label='original')
+            (cumulative_line,) = ax.plot(cumulative_recon[:, 0], lw=3, c='darkgoldenrod', alpha=0.6, label='cumulative')
+            (component_line,) = ax.plot(self.output_ds[0,:, 0], lw=3, c='steelblue', alpha=0.8)
+            for comp in range(self.output_ds.shape[2]):
+                cumulative_line.set_ydata(cumulative_recon[:, comp])
+                component_line.set_ydata(self.output_ds[0,:, comp])
+                component_line.set_label('component={}'.format(comp))
+                ax.relim()
+                ax.autoscale_view()
                 ax.legend()
                 fig.savefig(self.conf.plot_prefix + '_' + str(comp) + '.png', dpi=600)
-        print("pre self.output_ds.shape = ", self.output_ds.shape)
+        _logger.debug("pre self.output_ds.shape = %s", self.output_ds.shape)
 
         # transforms the dimensions from (features, ticks, channels) to (ticks, feats*channels)
-        ns_output = []
-        for n in range(self.output_ds.shape[1]):
-            row = []
-            for p in range(self.output_ds.shape[0]):
-                for c in range (self.output_ds.shape[2]):
-                    #row.append(self.output_ds[p,n,c])
-                    row.append(self.output_ds[p,n,c])
-            ns_output.append(row)
-        # convert to np array
-        self.output_ds = np.array(ns_output)
-        print("new self.output_ds.shape = ", self.output_ds.shape)
-        return self.output_ds
\ No newline at end of file
+        (feats, ticks, channels) = self.output_ds.shape
+        self.output_ds = np.transpose(self.output_ds, (1, 0, 2)).reshape(ticks, feats * channels)
+        _logger.debug("new self.output_ds.shape = %s", self.output_ds.shape)
+        return self.output_ds
+
+    def plot_w_correlation(self, mssa, components, title, filename):
+        """ Saves a plot of the absolute w-correlation matrix of a set of components.
+
+        Args:
+        mssa (MSSA): fitted MSSA instance used to calculate the w-correlation
+        components (ndarray): (ticks, components) array of components
+        title (string): title of the plot
+        filename (string): path and filename of the exported image
+        """
+        w_corr = mssa.w_correlation(components)
+        fig, ax = new_figure((12, 9))
+        im = ax.imshow(np.abs(w_corr), cmap='coolwarm', aspect='auto')
+        fig.colorbar(im, ax=ax)
+        ax.set_title(title)
+        fig.savefig(filename, dpi=200)
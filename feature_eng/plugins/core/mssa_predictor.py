@@ -4,22 +4,37 @@ This File contains the MSSAPredictor class plugin.
 """
 
 from feature_eng.plugin_base import PluginBase
+from feature_eng.plotting import new_figure
 import numpy as np
 import sys
 from pymssa import MSSA
 import copy
 import json
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.metrics import r2_score
-from sklearn.metrics import mean_squared_error
-from sklearn.metrics import mean_absolute_error
+import logging
 
 
 __author__ = "Harvey Bastidas"
 __copyright__ = "Harvey Bastidas"
 __license__ = "mit"
 
+_logger = logging.getLogger(__name__)
+
+def fit_window(mssa, s_data_w, forward_ticks, window_size):
+    """ Fits MSSA on a data window and predicts forward_ticks in the future.
+
+    Args:
+    mssa (MSSA): MSSA instance to be fitted
+    s_data_w (ndarray): (2*window_size, features) window of the centered input dataset
+    forward_ticks (int): number of ticks in the future to predict
+    window_size (int): MSSA window size
+
+    Returns:
+    (ndarray, ndarray): prediction of each feature and sum of channels per feature in the last tick of the window
+    """
+    mssa.fit(s_data_w)
+    fc = mssa.forecast(forward_ticks, timeseries_indices=None)
+    return fc[:,forward_ticks-1], mssa.components_[:,(2 * window_size) -1 , :].sum(axis=1)
+
 class MSSAPredictor(PluginBase):
     """ Core plugin for the FeatureEng class, after initialization, saves the data and after calling the store_data method """
 
@@ -36,6 +51,7 @@ class MSSAPredictor(PluginBase):
         parser.add_argument("--forward_ticks", help="Number of ticks in the future to predict.", default=10, type=int)
         parser.add_argument("--plot_prefix", help="Exports plots of each grouped channel superposed to the input dataset. Defaults to None.", default=None, type=str)
         parser.add_argument("--show_error", help="Calculate the Mean Squared Error (MSE) between the prediction and the input future value. Defaults to False", action="store_true", default=False)
+        parser.add_argument("--n_jobs", help="Number of parallel processes used to fit the sliding windows, -1 uses all the CPU cores. Defaults to 1", default=1, type=int)
         return parser
 
     def core(self, input_ds):
@@ -50,8 +66,10 @@ class MSSAPredictor(PluginBase):
         if self.conf.window_size > self.rows_d // 5:
             print("The window_size must be at maximum 1/5th of the rows of the input dataset")
             sys.exit()
-        # create an empty array with the estimated output shape
-        self.output_ds = np.empty(shape=(self.rows_d-(self.conf.window_size), self.cols_d))
+        n_jobs = self.conf.n_jobs if hasattr(self.conf, "n_jobs") else 1
+        if n_jobs == 0:
+            print("The n_jobs must be a positive number of processes or a negative one, -1 uses all the CPU cores")
+            sys.exit()
         
         # center the input_ds before fitting
         in_means = np.nanmean(input_ds, axis=0)
@@ -59,70 +77,57 @@ class MSSAPredictor(PluginBase):
 
         # calculate the output by performing MSSA on <segments> number of windows of data of size window_size
         segments = (self.rows_d - (2*self.conf.window_size + self.conf.forward_ticks))
-        grouped_output = []
-        for i in range(0, segments):
-            #progress = i*100/segments
-            #print("Segment: ",i,"/",segments, "     Progress: ", progress," %" )
-            # verify if i+(2*self.conf.window_size) is the last observation
-            first = i 
-            if (i != segments-1):
-                last = i + (2 * self.conf.window_size)
-            else:
-                last = self.rows_d
-            # slice the input_ds dataset in 2*self.conf.window_size ticks segments
-            s_data_w = input_ds[first : last,:]
-            # center the data before fitting
-            # only the first time, run svht, in following iterations, use the same n_components, without executing the svht algo
-            if i == 0:
-                # uses SVHT for selecting number of components if required from the conf parameters
-                if self.conf.num_components == 0:
-                    mssa = MSSA(n_components='svht', window_size=self.conf.window_size, verbose=False)
-                    mssa.fit(s_data_w)
-                    print("Automatically Selected Rank (number of components)= ",str(mssa.rank_))
-                    rank = int(mssa.rank_)
-                else:
-                    rank = self.conf.num_components
-                    mssa = MSSA(n_components=rank, window_size=self.conf.window_size, verbose=False)
-                    mssa.fit(s_data_w)
-            else:
-                mssa = MSSA(n_components=rank, window_size=self.conf.window_size, verbose=False)
-                mssa.fit(s_data_w)
-
-            fc = mssa.forecast(self.conf.forward_ticks, timeseries_indices=None)        
-            
-            # extracts the required tick from prediction for each feature in fc_col
-            fc_col = fc[:,self.conf.forward_ticks-1]
-            (rows_o,) = fc_col.shape
-            # transpose the predictions into a row 
-            fc_row = fc_col.reshape(1,rows_o)
-            # extract the row of components for all features into a single column
-            comp_col = mssa.components_[:,(2 * self.conf.window_size) -1 , :].sum(axis=1)
-            (rows_o,) = comp_col.shape
-            # transpose the sum of channels per feature into a row
-            comp_row = comp_col.reshape(1,rows_o)
-            
-            
-            # concatenate otput array with the new predictions (5 tick fw) and the component sum (last tick in segment before prediction) in another array for plotting
-            if i == 0:
-                self.output_ds = fc_row
-                denoised = comp_row                
-            else:
-                self.output_ds = np.concatenate((self.output_ds, fc_row), axis = 0)
-                denoised = np.concatenate((denoised, comp_row), axis = 0)
+        # preallocate the predictions and the denoised (sum of channels) arrays with one row per segment
+        self.output_ds = np.empty(shape=(segments, self.cols_d))
+        denoised = np.empty(shape=(segments, self.cols_d))
+        # the MSSA instance is constructed once and refitted for each segment
+        # uses SVHT for selecting number of components if required from the conf parameters
+        if self.conf.num_components == 0:
+            mssa = MSSA(n_components='svht', window_size=self.conf.window_size, verbose=False)
+        else:
+            mssa = MSSA(n_components=self.conf.num_components, window_size=self.conf.window_size, verbose=False)
+        # each window has 2*self.conf.window_size ticks, except the last one that ends in the last observation
+        bounds = [(i, i + (2 * self.conf.window_size)) for i in range(0, segments-1)] + [(segments-1, self.rows_d)]
+        # fit the first window, if required, it selects the number of components with SVHT
+        (first, last) = bounds[0]
+        self.output_ds[0], denoised[0] = fit_window(mssa, input_ds[first : last,:], self.conf.forward_ticks, self.conf.window_size)
+        # in following windows, use the same n_components, without executing the svht algo
+        if mssa.n_components == 'svht':
+            _logger.info("Automatically Selected Rank (number of components)= %s", mssa.rank_)
+            mssa.n_components = int(mssa.rank_)
+        if n_jobs == 1:
+            for i in range(1, segments):
+                (first, last) = bounds[i]
+                self.output_ds[i], denoised[i] = fit_window(mssa, input_ds[first : last,:], self.conf.forward_ticks, self.conf.window_size)
+        else:
+            # the rest of the windows are independent once the number of components is fixed, fit them in parallel processes
+            from joblib import Parallel, delayed
+            w_mssa = MSSA(n_components=mssa.n_components, window_size=self.conf.window_size, verbose=False)
+            results = Parallel(n_jobs=n_jobs)(
+                delayed(fit_window)(w_mssa, input_ds[first : last,:], self.conf.forward_ticks, self.conf.window_size)
+                for (first, last) in bounds[1:]
+            )
+            for i, (fc_row, comp_row) in enumerate(results, start=1):
+                self.output_ds[i] = fc_row
+                denoised[i] = comp_row
         # calcluate shape of output_ds
-        try:
-            rows_o, cols_o = self.output_ds.shape
-        except:
-            (rows_o,) = self.output_ds.shape
-            cols_o = 1
-            self.output_ds = self.output_ds.reshape(rows_o, cols_o)
+        rows_o, cols_o = self.output_ds.shape
 
         # calculate error on the last half of the input dataset
         #r2 = r2_score(input_ds[(2 * self.conf.window_size) + self.conf.forward_ticks-1 : self.rows_d-self.conf.forward_ticks-1, feature], self.output_ds[:rows_o-self.conf.forward_ticks, feature])
         #r2 = r2_score(input_ds[(2 * self.conf.window_size) + self.conf.forward_ticks-1 + (self.rows_d//2): self.rows_d-self.conf.forward_ticks-1, 0], self.output_ds[(self.rows_d//2):rows_o-self.conf.forward_ticks, 0])
-        r2 = r2_score(input_ds[(self.rows_d-self.conf.forward_ticks-1)-(self.rows_d//2): self.rows_d-self.conf.forward_ticks-1, 0], self.output_ds[(rows_o-self.conf.forward_ticks)-(self.rows_d//2) :rows_o-self.conf.forward_ticks, 0])
-        mse = mean_squared_error(input_ds[(self.rows_d-self.conf.forward_ticks-1)-(self.rows_d//2): self.rows_d-self.conf.forward_ticks-1, 0], self.output_ds[(rows_o-self.conf.forward_ticks)-(self.rows_d//2) :rows_o-self.conf.forward_ticks, 0])
-        mae = mean_absolute_error(input_ds[(self.rows_d-self.conf.forward_ticks-1)-(self.rows_d//2): self.rows_d-self.conf.forward_ticks-1, 0], self.output_ds[(rows_o-self.conf.forward_ticks)-(self.rows_d//2) :rows_o-self.conf.forward_ticks, 0])
+        y_true = input_ds[(self.rows_d-self.conf.forward_ticks-1)-(self.rows_d//2): self.rows_d-self.conf.forward_ticks-1, 0]
+        y_pred = self.output_ds[(rows_o-self.conf.forward_ticks)-(self.rows_d//2) :rows_o-self.conf.forward_ticks, 0]
+        # the three metrics share the same residual, r2 = 1 - SS_res/SS_tot = 1 - mse/var(y_true)
+        residual = y_true - y_pred
+        mse = np.mean(residual * residual)
+        mae = np.mean(np.abs(residual))
+        var_true = np.var(y_true)
+        if var_true != 0:
+            r2 = 1.0 - mse / var_true
+        else:
+            # constant y_true, same as sklearn r2_score: 1.0 for a perfect prediction, else 0.0
+            r2 = 1.0 if mse == 0 else 0.0
         self.error = r2
         # plots th original data, predicted data and denoised data.
         if self.conf.plot_prefix != None:
@@ -131,7 +136,7 @@ class MSSAPredictor(PluginBase):
             # for the 5th and the next components, save plots containing the original and cummulative timeseries for the first data column
             feature = 0
             for feature in range(self.cols_d):
-                fig, ax = plt.subplots(figsize=(18, 7))
+                fig, ax = new_figure((18, 7))
                 ax.plot(self.output_ds[:rows_o-self.conf.forward_ticks, feature], lw=3, c='steelblue', alpha=0.8, label='predicted')
                 ax.plot(denoised[self.conf.forward_ticks:, feature], lw=3, c='darkgoldenrod', alpha=0.6, label='denoised')
                 ax.plot(input_ds[(2 * self.conf.window_size) + self.conf.forward_ticks-1 : self.rows_d-self.conf.forward_ticks-1, feature], lw=3, alpha=0.2, c='k', label='original') 
@@ -4,8 +4,23 @@ This File contains the LoadCSV class plugin.
 """
 
 from feature_eng.plugin_base import PluginBase
+import numpy as np
 from numpy import genfromtxt
 from sys import exit
+from collections import OrderedDict
+import os
+
+# pyarrow is optional, if available its multi-threaded parser is used to load the dataset
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+# pandas is used as fallback, its C parser is faster than genfromtxt
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 __author__ = "Harvey Bastidas"
 __copyright__ = "Harvey Bastidas"
@@ -13,6 +28,13 @@ __license__ = "mit"
 
 class LoadCSV(PluginBase): 
     """ input plugin for the FeatureEng class, after initialization, the input_ds attribute is set """
+
+    # datasets already loaded in this process, keyed by absolute path, with the file modification time,
+    # ordered from the least to the most recently used
+    _cache = OrderedDict()
+    # maximum number of datasets kept in the cache, disabled by default because each run loads its input file once
+    # and the cache would keep the dataset and a copy of it in memory
+    cache_size = 0
     
     def __init__(self, conf):
         """ Initializes PluginBase. Do NOT delete the following line whether you have initialization code or not. """
@@ -24,9 +46,73 @@ class LoadCSV(PluginBase):
         """ Adds command-line arguments to be parsed, overrides base class """
         parser.add_argument("--input_file", help="Input dataset file to load including path.", required=True)
         return parser
-    
+
     def load_data(self):
-        """ Load the input dataset """
-        self.input_ds = genfromtxt(self.conf.input_file, delimiter=",")
+        """ Load the input dataset, if cache_size is set, reuses the dataset loaded previously from the same file if it was not modified """
+        if LoadCSV.cache_size == 0:
+            self.input_ds = self.read_csv()
+            return self.input_ds
+        path = os.path.abspath(self.conf.input_file)
+        mtime = os.stat(path).st_mtime_ns
+        cached = LoadCSV._cache.get(path)
+        if (cached == None) or (cached[0] != mtime):
+            cached = (mtime, self.read_csv())
+            LoadCSV._cache[path] = cached
+        # mark the dataset as the most recently used and evict the least recently used ones
+        LoadCSV._cache.move_to_end(path)
+        while len(LoadCSV._cache) > LoadCSV.cache_size:
+            LoadCSV._cache.popitem(last=False)
+        # core plugins may modify the input dataset in-place, return a copy of the cached one
+        self.input_ds = cached[1].copy()
         return self.input_ds
-        
+
+    def read_csv(self):
+        """ Read the input dataset from the input file """
+        # each parser falls back to the next one: pyarrow, pandas and then genfromtxt
+        if pacsv != None:
+            try:
+                return self.load_arrow()
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                # non-numeric fields or rows with different number of fields
+                pass
+        if pd != None:
+            try:
+                return self.load_pandas()
+            except ValueError:
+                # non-numeric fields or rows with different number of fields
+                pass
+        return genfromtxt(self.conf.input_file, delimiter=",")
+
+    def load_arrow(self):
+        """ Load the input dataset using the pyarrow CSV parser.
+
+        Returns:
+        (ndarray): float64 dataset, squeezed the same way as genfromtxt
+        """
+        table = pacsv.read_csv(
+            self.conf.input_file,
+            read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+            parse_options=pacsv.ParseOptions(delimiter=",")
+        )
+        # cast all columns at once, raises ArrowInvalid if a column is not numeric
+        table = table.cast(pa.schema([(name, pa.float64()) for name in table.column_names]))
+        data = np.column_stack([column.to_numpy() for column in table.columns])
+        return np.squeeze(data)
+
+    def load_pandas(self):
+        """ Load the input dataset using the pandas C parser.
+
+        Empty fields are loaded as nan. Rows with a different number of fields raise ValueError as in genfromtxt.
+
+        Returns:
+        (ndarray): float64 dataset, squeezed the same way as genfromtxt
+        """
+        data = pd.read_csv(self.conf.input_file, header=None, dtype=np.float64).to_numpy()
+        # pandas fills the missing fields of short rows with nan, if there is nan, count the fields of every row
+        if np.isnan(data).any():
+            with open(self.conf.input_file) as in_file:
+                fields = set(line.count(",") + 1 for line in in_file if line.strip() != "")
+            if len(fields) > 1:
+                raise ValueError("Rows with different number of fields in " + self.conf.input_file)
+        return np.squeeze(data)
+
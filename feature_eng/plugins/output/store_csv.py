@@ -4,7 +4,7 @@ This File contains the StoreCSV class plugin.
 """
 
 from feature_eng.plugin_base import PluginBase
-from numpy import savetxt
+import numpy as np
 from sys import exit
 
 __author__ = "Harvey Bastidas"
@@ -14,6 +14,9 @@ __license__ = "mit"
 class StoreCSV(PluginBase): 
     """ Output plugin for the FeatureEng class, after initialization, saves the data and after calling the store_data method """
 
+    # approximate number of values formatted per write
+    chunk_cells = 1 << 16
+
     def __init__(self, conf):
         """ Constructor using same parameters as base class """
         super().__init__(conf)
@@ -26,7 +29,23 @@ class StoreCSV(PluginBase):
         return parser
 
     def store_data(self, output_ds):
-        """ Save preprocessed data """
-        savetxt(self.conf.output_file, output_ds, delimiter=",")
+        """ Save preprocessed data, produces the same output as numpy.savetxt with delimiter="," """
+        data = np.asarray(output_ds)
+        # as in savetxt, a 1-D array is stored as a single column
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        elif data.ndim != 2:
+            raise ValueError("Expected 1D or 2D array, got %dD array instead" % data.ndim)
+        row_fmt = ",".join(["%.18e"] * data.shape[1]) + "\n"
+        # the blocks have a similar number of values for any number of columns,
+        # rows without columns are written as empty lines as in savetxt
+        chunk_rows = max(1, self.chunk_cells // max(1, data.shape[1]))
+        # use a 1MB write buffer instead of the default one to reduce the number of write syscalls
+        with open(self.conf.output_file, "w", buffering=1 << 20) as out_file:
+            # format blocks of rows with a single string operation instead of one per row
+            for first in range(0, data.shape[0], chunk_rows):
+                block = data[first : first + chunk_rows]
+                out_file.write((row_fmt * block.shape[0]) % tuple(block.ravel()))
+
             
     
\ No newline at end of file
@@ -6,6 +6,8 @@ import sys
 import os
 from filecmp import cmp
 from feature_eng.feature_eng import FeatureEng
+from feature_eng.plugins.core.heuristic_ts import HeuristicTS
+import numpy as np
 
 __author__ = "Harvey Bastidas"
 __copyright__ = "Harvey Bastidas"
@@ -118,4 +120,37 @@ class TestHeuristicTS:
         # get the size of the output dataset
         rows_o, cols_o = self.get_size_csv(os.path.join(os.path.dirname(__file__), "data/test_c02_t04_output.csv")   )
         # assert if the number of rows an colums is less than the input dataset and > 0
-        assert (cols_o == 1) and (rows_o == rows_d - self.conf.forward_ticks)
\ No newline at end of file
+        assert (cols_o == 1) and (rows_o == rows_d - self.conf.forward_ticks)
+
+    def loop_output(self, input_ds, use_current):
+        """ Calculates the training signal with the per-tick loops of the original implementation.
+
+        Args:
+        input_ds (ndarray): input dataset
+        use_current (bool): selects the loop of the original use_current mode, both produce the same signal
+
+        Returns:
+        (ndarray): (rows - forward_ticks, 1) training signal
+        """
+        rows_d = input_ds.shape[0]
+        ft = self.conf.forward_ticks
+        output_ds = np.empty(shape=(rows_d - ft, 1))
+        if use_current == False:
+            for i in range(rows_d - ft):
+                output_ds[i, 0] = input_ds[i + ft, self.conf.ema_fast] - input_ds[i, self.conf.ema_slow]
+        else:
+            for i in range(ft, rows_d):
+                output_ds[i - ft, 0] = input_ds[i, self.conf.ema_fast] - input_ds[i - ft, self.conf.ema_slow]
+        return output_ds
+
+    def test_C02T05_core_loop_values(self):
+        """ Asses that the output values are the same as with the per-tick loops for both use_current modes """
+        input_ds = np.genfromtxt(self.conf.input_file, delimiter=",")
+        self.conf.args = None
+        matches = []
+        for use_current in [False, True]:
+            self.conf.use_current = use_current
+            output_ds = HeuristicTS(self.conf).core(input_ds)
+            matches.append(np.array_equal(output_ds, self.loop_output(input_ds, use_current)))
+        # assertion
+        assert all(matches)
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import sys
+import os
+import numpy as np
+from feature_eng.plugins.input import load_csv
+from feature_eng.plugins.input.load_csv import LoadCSV
+
+__author__ = "Harvey Bastidas"
+__copyright__ = "Harvey Bastidas"
+__license__ = "mit"
+
+class Conf:
+    """ This method initialize the configuration variables for a plugin """
+
+    def __init__(self):
+        """ Component Tests Constructor """
+        self.input_file = os.path.join(os.path.dirname(__file__), "data/test_input.csv")
+        """ Test dataset filename """
+        self.args = None
+
+class TestLoadCSV:
+    """ Component Tests  """
+
+    def setup_method(self, test_method):
+        """ Component Tests Constructor """
+        self.conf = Conf()
+        # start every test without datasets loaded by previous tests
+        LoadCSV._cache.clear()
+
+    def count_reads(self, monkeypatch, cache_size=4):
+        """ Enables the cache and counts the calls to LoadCSV.read_csv, used to detect cache hits.
+
+        Args:
+        monkeypatch (MonkeyPatch): pytest monkeypatch fixture
+        cache_size (int): maximum number of cached datasets, 0 disables the cache
+
+        Returns:
+        (list): list that gets an element appended per call to read_csv
+        """
+        monkeypatch.setattr(LoadCSV, "cache_size", cache_size)
+        calls = []
+        read_csv = LoadCSV.read_csv
+        def counted_read_csv(plugin):
+            calls.append(plugin.conf.input_file)
+            return read_csv(plugin)
+        monkeypatch.setattr(LoadCSV, "read_csv", counted_read_csv)
+        return calls
+
+    def test_C05T01_cache_hit(self, tmp_path, monkeypatch):
+        """ Loads the same unmodified file twice and asses that it is parsed only once """
+        self.conf.input_file = str(tmp_path / "input.csv")
+        np.savetxt(self.conf.input_file, np.arange(12.0).reshape(4, 3), delimiter=",")
+        calls = self.count_reads(monkeypatch)
+        first = LoadCSV(self.conf).load_data()
+        second = LoadCSV(self.conf).load_data()
+        # assertion
+        assert (len(calls) == 1) and np.array_equal(first, second)
+
+    def test_C05T02_cache_modified_file(self, tmp_path, monkeypatch):
+        """ Asses that the file is parsed again after its modification time changes """
+        self.conf.input_file = str(tmp_path / "input.csv")
+        np.savetxt(self.conf.input_file, np.arange(12.0).reshape(4, 3), delimiter=",")
+        calls = self.count_reads(monkeypatch)
+        LoadCSV(self.conf).load_data()
+        np.savetxt(self.conf.input_file, np.ones((4, 3)), delimiter=",")
+        # set a different modification time in case the filesystem timestamp resolution is low
+        stat = os.stat(self.conf.input_file)
+        os.utime(self.conf.input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        data = LoadCSV(self.conf).load_data()
+        # assertion
+        assert (len(calls) == 2) and np.array_equal(data, np.ones((4, 3)))
+
+    def test_C05T03_cache_copy(self, monkeypatch):
+        """ Asses that modifying in-place a loaded dataset does not change the dataset returned by a later load """
+        self.count_reads(monkeypatch)
+        first = LoadCSV(self.conf).load_data()
+        expected = first.copy()
+        first[:] = 0
+        second = LoadCSV(self.conf).load_data()
+        # assertion
+        assert np.allclose(second, expected, equal_nan=True)
+
+    def test_C05T04_cache_size(self, tmp_path, monkeypatch):
+        """ Loads more files than the cache size and asses that the least recently used are evicted """
+        self.count_reads(monkeypatch)
+        for i in range(LoadCSV.cache_size + 2):
+            self.conf.input_file = str(tmp_path / ("input_" + str(i) + ".csv"))
+            np.savetxt(self.conf.input_file, np.full((2, 2), float(i)), delimiter=",")
+            LoadCSV(self.conf).load_data()
+        # assertion
+        assert (len(LoadCSV._cache) == LoadCSV.cache_size) and (os.path.abspath(str(tmp_path / "input_0.csv")) not in LoadCSV._cache)
+
+    def test_C05T14_cache_disabled(self, monkeypatch):
+        """ Asses that by default the cache is disabled, the file is parsed on every load and no dataset is kept """
+        calls = self.count_reads(monkeypatch, cache_size=LoadCSV.cache_size)
+        LoadCSV(self.conf).load_data()
+        LoadCSV(self.conf).load_data()
+        # assertion
+        assert (LoadCSV.cache_size == 0) and (len(calls) == 2) and (len(LoadCSV._cache) == 0)
+
+    def test_C05T05_pandas_fallback(self, monkeypatch):
+        """ Without pyarrow, asses that the pandas parser is used and loads the same dataset as genfromtxt """
+        pytest.importorskip("pandas")
+        monkeypatch.setattr(load_csv, "pacsv", None)
+        calls = []
+        load_pandas = LoadCSV.load_pandas
+        monkeypatch.setattr(LoadCSV, "load_pandas", lambda plugin: calls.append(1) or load_pandas(plugin))
+        data = LoadCSV(self.conf).read_csv()
+        expected = np.genfromtxt(self.conf.input_file, delimiter=",")
+        # assertion
+        assert (len(calls) == 1) and (data.shape == expected.shape) and np.allclose(data, expected, equal_nan=True)
+
+    def test_C05T06_arrow_error_pandas_fallback(self, monkeypatch):
+        """ Asses that the pandas parser is used when pyarrow is installed but fails to parse the file """
+        pa = pytest.importorskip("pyarrow")
+        pytest.importorskip("pandas")
+        def failed_load_arrow(plugin):
+            raise pa.ArrowInvalid("forced error")
+        monkeypatch.setattr(LoadCSV, "load_arrow", failed_load_arrow)
+        calls = []
+        load_pandas = LoadCSV.load_pandas
+        monkeypatch.setattr(LoadCSV, "load_pandas", lambda plugin: calls.append(1) or load_pandas(plugin))
+        data = LoadCSV(self.conf).read_csv()
+        expected = np.genfromtxt(self.conf.input_file, delimiter=",")
+        # assertion
+        assert (len(calls) == 1) and (data.shape == expected.shape) and np.allclose(data, expected, equal_nan=True)
+
+    def test_C05T07_genfromtxt_fallback(self, monkeypatch):
+        """ Without pyarrow and pandas, asses that the dataset is loaded with genfromtxt """
+        monkeypatch.setattr(load_csv, "pacsv", None)
+        monkeypatch.setattr(load_csv, "pd", None)
+        data = LoadCSV(self.conf).read_csv()
+        expected = np.genfromtxt(self.conf.input_file, delimiter=",")
+        # assertion
+        assert (data.shape == expected.shape) and np.allclose(data, expected, equal_nan=True)
+
+    def test_C05T08_pandas_short_rows(self, tmp_path, monkeypatch):
+        """ Without pyarrow, asses that a file with a short row is rejected as genfromtxt does instead of padded with nan """
+        pytest.importorskip("pandas")
+        monkeypatch.setattr(load_csv, "pacsv", None)
+        self.conf.input_file = str(tmp_path / "input.csv")
+        with open(self.conf.input_file, "w") as in_file:
+            in_file.write("1,2,3\n4,5\n7,8,9\n")
+        # assertion
+        with pytest.raises(ValueError):
+            LoadCSV(self.conf).read_csv()
+
+    def test_C05T09_pandas_empty_fields(self, tmp_path, monkeypatch):
+        """ Without pyarrow, asses that empty fields are loaded as nan by the pandas parser, the same as genfromtxt """
+        pytest.importorskip("pandas")
+        monkeypatch.setattr(load_csv, "pacsv", None)
+        # fail if the genfromtxt fallback is used
+        def failed_genfromtxt(*args, **kwargs):
+            raise AssertionError("genfromtxt fallback used")
+        monkeypatch.setattr(load_csv, "genfromtxt", failed_genfromtxt)
+        self.conf.input_file = str(tmp_path / "input.csv")
+        with open(self.conf.input_file, "w") as in_file:
+            in_file.write("1,,3\n4,5,\n7,8,9\n")
+        data = LoadCSV(self.conf).read_csv()
+        expected = np.genfromtxt(self.conf.input_file, delimiter=",")
+        # assertion
+        assert (data.shape == expected.shape) and np.allclose(data, expected, equal_nan=True)
+
+    def arrow_and_genfromtxt(self, tmp_path, content):
+        """ Loads a test file with the pyarrow parser and with genfromtxt.
+
+        Args:
+        tmp_path (Path): pytest temporary directory
+        content (string): contents of the test file
+
+        Returns:
+        (ndarray,ndarray): dataset loaded with pyarrow, dataset loaded with genfromtxt
+        """
+        pytest.importorskip("pyarrow")
+        self.conf.input_file = str(tmp_path / "input.csv")
+        with open(self.conf.input_file, "w") as in_file:
+            in_file.write(content)
+        return (LoadCSV(self.conf).load_arrow(), np.genfromtxt(self.conf.input_file, delimiter=","))
+
+    def test_C05T10_arrow_dtype(self):
+        """ Asses that the dataset loaded with pyarrow has the same dtype and values as with genfromtxt """
+        pytest.importorskip("pyarrow")
+        data = LoadCSV(self.conf).load_arrow()
+        expected = np.genfromtxt(self.conf.input_file, delimiter=",")
+        # assertion
+        assert (data.dtype == expected.dtype == np.float64) and (data.shape == expected.shape) and np.allclose(data, expected, equal_nan=True)
+
+    def test_C05T11_arrow_single_column(self, tmp_path):
+        """ Asses that a single-column file is squeezed to the same shape as with genfromtxt """
+        data, expected = self.arrow_and_genfromtxt(tmp_path, "1\n2\n3\n4\n")
+        # assertion
+        assert (data.shape == expected.shape == (4,)) and np.array_equal(data, expected)
+
+    def test_C05T12_arrow_single_row(self, tmp_path):
+        """ Asses that a single-row file is squeezed to the same shape as with genfromtxt """
+        data, expected = self.arrow_and_genfromtxt(tmp_path, "1,2,3,4\n")
+        # assertion
+        assert (data.shape == expected.shape == (4,)) and np.array_equal(data, expected)
+
+    def test_C05T13_arrow_empty_fields(self, tmp_path):
+        """ Asses that empty fields are loaded as nan, the same as genfromtxt """
+        data, expected = self.arrow_and_genfromtxt(tmp_path, "1,,3\n4,5,\n7,8,9\n")
+        # assertion
+        assert (data.dtype == expected.dtype) and (data.shape == expected.shape) and np.allclose(data, expected, equal_nan=True)
@@ -6,6 +6,11 @@ import sys
 import os
 from filecmp import cmp
 from feature_eng.feature_eng import FeatureEng
+from feature_eng.plugins.core.mssa_decomposer import MSSADecomposer
+from pymssa import MSSA
+import numpy as np
+import copy
+import json
 
 __author__ = "Harvey Bastidas"
 __copyright__ = "Harvey Bastidas"
@@ -206,4 +211,96 @@ class TestMSSADecomposer:
         # get the size of the output dataset
         rows_o, cols_o = self.get_size_csv(self.conf.output_file)
         # assert if there are 3 groups per feature in the output dataset
-        assert (cols_o > self.cols_d)
\ No newline at end of file
+        assert (cols_o > self.cols_d)
+
+    def reference_output(self, input_ds, group_file):
+        """ Calculates the decomposition as the original implementation, with a new MSSA instance per segment, 
+        concatenating the output of each segment and rearranging the dimensions with nested loops.
+
+        Args:
+        input_ds (ndarray): (ticks, features) input dataset
+        group_file (string): JSON file with the component groups or None
+
+        Returns:
+        (ndarray): (ticks, features*channels) decomposed dataset
+        """
+        input_ds = input_ds - np.nanmean(input_ds, axis=0)
+        (rows_d, cols_d) = input_ds.shape
+        window_size = self.conf.window_size
+        segments = rows_d // (2 * window_size)
+        grouped_output = []
+        if group_file != None:
+            with open(group_file) as json_file:
+                groups = json.load(json_file)
+        for i in range(0, segments):
+            first = i * (2 * window_size)
+            if (i != segments-1):
+                last = (i+1) * (2 * window_size)
+            else:
+                last = rows_d
+            if i == 0:
+                if self.conf.num_components == 0:
+                    mssa = MSSA(n_components='svht', window_size=window_size, verbose=False)
+                    mssa.fit(input_ds[first : last,:])
+                    rank = int(mssa.rank_)
+                else:
+                    rank = self.conf.num_components
+                    mssa = MSSA(n_components=rank, window_size=window_size, verbose=False)
+                    mssa.fit(input_ds[first : last,:])
+            else:
+                mssa = MSSA(n_components=rank, window_size=window_size, verbose=False)
+                mssa.fit(input_ds[first : last,:])
+            if group_file == None:
+                if i == 0:
+                    output_ds = np.array(mssa.components_)
+                else:
+                    output_ds = np.concatenate((output_ds, mssa.components_), axis = 1)
+            else:
+                for j in range(0, cols_d):
+                    mssa.set_ts_component_groups(j, groups)
+                    if i == 0:
+                        grouped_output.append(copy.deepcopy(mssa.grouped_components_[j]))
+                    else:
+                        grouped_output[j] = np.concatenate((grouped_output[j], copy.deepcopy(mssa.grouped_components_[j])), axis = 0)
+                output_ds = np.array(grouped_output)
+        ns_output = []
+        for n in range(output_ds.shape[1]):
+            row = []
+            for p in range(output_ds.shape[0]):
+                for c in range (output_ds.shape[2]):
+                    row.append(output_ds[p,n,c])
+            ns_output.append(row)
+        return np.array(ns_output)
+
+    def core_and_reference(self):
+        """ Decomposes the first 4 columns and 250 ticks of the HeuristicTS test input with MSSADecomposer.core and with reference_output()
+
+        Returns:
+        (ndarray,ndarray): output of MSSADecomposer.core, output of reference_output()
+        """
+        input_ds = np.genfromtxt(os.path.join(os.path.dirname(__file__), "data/test_input.csv"), delimiter=",")[:250, :4]
+        # 6 segments, the last one with 50 ticks
+        self.conf.window_size = 20
+        self.conf.args = None
+        output_ds = MSSADecomposer(self.conf).core(input_ds)
+        return (output_ds, self.reference_output(input_ds, self.conf.group_file))
+
+    def test_C03T10_core_values(self):
+        """ Asses that the output values are the same as in the original implementation """
+        output_ds, expected = self.core_and_reference()
+        # assertion
+        assert (output_ds.shape == expected.shape == (250, 4 * self.conf.num_components)) and np.allclose(output_ds, expected)
+
+    def test_C03T11_core_values_group_file(self):
+        """ Asses that the output values using a group file are the same as in the original implementation """
+        self.conf.group_file = os.path.join(os.path.dirname(__file__), "data/groups.json")
+        output_ds, expected = self.core_and_reference()
+        # assertion, 4 groups per feature
+        assert (output_ds.shape == expected.shape == (250, 4 * 4)) and np.allclose(output_ds, expected)
+
+    def test_C03T12_core_values_svht(self):
+        """ Asses that the output values using svht are the same as in the original implementation """
+        self.conf.num_components = 0
+        output_ds, expected = self.core_and_reference()
+        # assertion
+        assert (output_ds.shape == expected.shape) and np.allclose(output_ds, expected)
@@ -6,6 +6,8 @@ import sys
 import os
 from filecmp import cmp
 from feature_eng.feature_eng import FeatureEng
+from feature_eng.plugins.core.mssa_predictor import MSSAPredictor
+import numpy as np
 import matplotlib.pyplot as plt
 
 __author__ = "Harvey Bastidas"
@@ -152,4 +154,26 @@ class TestMSSAPredictor:
         rows_o, cols_o = self.get_size_csv(self.conf.output_file)
         # assert if there are 3 groups per feature in the output dataset
         assert (cols_o == cols_d) and (rows_o < rows_d)
-        
+
+    def test_C04T06_n_jobs(self):
+        """ Asses that fitting the windows in 2 parallel processes produces the same output as the serial fit """
+        pytest.importorskip("joblib")
+        # 200 rows are enough for the default window_size of 30
+        input_ds = np.genfromtxt(self.conf.input_file, delimiter=",")[:200]
+        self.conf.args = None
+        self.conf.show_error = False
+        self.conf.n_jobs = 1
+        serial_ds = MSSAPredictor(self.conf).core(input_ds)
+        self.conf.n_jobs = 2
+        parallel_ds = MSSAPredictor(self.conf).core(input_ds)
+        # assertion
+        assert (parallel_ds.shape == serial_ds.shape) and np.allclose(parallel_ds, serial_ds)
+
+    def test_C04T07_n_jobs_zero(self):
+        """ Asses that n_jobs = 0 is rejected """
+        input_ds = np.genfromtxt(self.conf.input_file, delimiter=",")[:200]
+        self.conf.args = None
+        self.conf.n_jobs = 0
+        # assertion
+        with pytest.raises(SystemExit):
+            MSSAPredictor(self.conf).core(input_ds)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import os
+import numpy as np
+from feature_eng.plugins.output.store_csv import StoreCSV
+
+__author__ = "Harvey Bastidas"
+__copyright__ = "Harvey Bastidas"
+__license__ = "mit"
+
+class Conf:
+    """ This method initialize the configuration variables for a plugin """
+
+    def __init__(self):
+        """ Component Tests Constructor """
+        self.output_file = os.path.join(os.path.dirname(__file__), "data/test_c06_output.csv")
+        """ Output dataset filename """
+        self.args = None
+
+class TestStoreCSV:
+    """ Component Tests  """
+
+    def setup_method(self, test_method):
+        """ Component Tests Constructor """
+        self.conf = Conf()
+
+    def store_and_savetxt(self, tmp_path, data):
+        """ Stores a dataset with StoreCSV and with numpy.savetxt, used in all tests.
+
+        Args:
+        tmp_path (Path): pytest temporary directory
+        data (ndarray): dataset to store
+
+        Returns:
+        (bytes,bytes): contents of the file stored by StoreCSV, contents of the file stored by savetxt
+        """
+        self.conf.output_file = str(tmp_path / "output.csv")
+        StoreCSV(self.conf).store_data(data)
+        np.savetxt(str(tmp_path / "expected.csv"), data, delimiter=",")
+        with open(self.conf.output_file, "rb") as out_file, open(str(tmp_path / "expected.csv"), "rb") as expected_file:
+            return (out_file.read(), expected_file.read())
+
+    def test_C06T01_1d(self, tmp_path):
+        """ Asses that a 1-D dataset is stored the same as with savetxt """
+        stored, expected = self.store_and_savetxt(tmp_path, np.linspace(-1.0, 1.0, 100))
+        # assertion
+        assert stored == expected
+
+    def test_C06T02_2d(self, tmp_path):
+        """ Asses that a 2-D dataset is stored the same as with savetxt """
+        stored, expected = self.store_and_savetxt(tmp_path, np.random.rand(100, 7))
+        # assertion
+        assert stored == expected
+
+    def test_C06T03_nan(self, tmp_path):
+        """ Asses that a dataset with nan and inf values is stored the same as with savetxt """
+        data = np.random.rand(20, 3)
+        data[3, 1] = np.nan
+        data[7, 0] = np.inf
+        data[11, 2] = -np.inf
+        stored, expected = self.store_and_savetxt(tmp_path, data)
+        # assertion
+        assert stored == expected
+
+    def test_C06T04_blocks(self, tmp_path, monkeypatch):
+        """ Asses that datasets written in several blocks, including blocks of a single row, are stored the same as with savetxt """
+        monkeypatch.setattr(StoreCSV, "chunk_cells", 8)
+        stored, expected = self.store_and_savetxt(tmp_path, np.random.rand(25, 3))
+        wide_stored, wide_expected = self.store_and_savetxt(tmp_path, np.random.rand(5, 11))
+        # assertion
+        assert (stored == expected) and (wide_stored == wide_expected)
+
+    def test_C06T05_no_columns(self, tmp_path):
+        """ Asses that a 2-D dataset without columns is stored the same as with savetxt """
+        stored, expected = self.store_and_savetxt(tmp_path, np.empty((5, 0)))
+        # assertion
+        assert stored == expected
+
+    def test_C06T06_3d(self, tmp_path):
+        """ Asses that a 3-D dataset raises ValueError as in savetxt """
+        self.conf.output_file = str(tmp_path / "output.csv")
+        # assertion
+        with pytest.raises(ValueError):
+            StoreCSV(self.conf).store_data(np.zeros((2, 3, 4)))